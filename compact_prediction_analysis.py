@@ -5,10 +5,152 @@ Creates lightweight database files that just store the dates for API usage.
 """
 
 import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import os
 import json
 
+# Polars computes the rolling validity windows 2-3x faster than the pandas
+# path; fall back to pandas + numpy when it is not installed
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+    pl = None
+
+# Numba compiles the per-inverter running-count scan to native code; the
+# numpy cumsum fallback below gives the same result
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def extract_valid_ends(valid, sequence_length):
+        """Indices whose preceding sequence_length readings are all valid"""
+        n = valid.shape[0]
+        out = np.empty(n, dtype=np.int64)
+        count = 0  # valid readings in the window ending at the current row
+        m = 0
+        for i in range(n):
+            if valid[i]:
+                count += 1
+            else:
+                count = 0
+            # a prediction at i+1 needs rows i-L+1..i all valid
+            if count >= sequence_length and i + 1 < n:
+                out[m] = i + 1
+                m += 1
+        return out[:m]
+
+def build_inverter_entry(source_key, pred_times):
+    """Build the JSON entry and int64 epoch array for one inverter's timestamps"""
+    pred_times = np.asarray(pred_times, dtype='datetime64[ns]')
+    prediction_timestamps = [pd.Timestamp(t).isoformat() for t in pred_times]
+
+    inverter_entry = {
+        'inverter_id': int(source_key),
+        'prediction_count': len(prediction_timestamps),
+        'first_prediction': prediction_timestamps[0] if prediction_timestamps else None,
+        'last_prediction': prediction_timestamps[-1] if prediction_timestamps else None,
+        'timestamps': prediction_timestamps  # Just the timestamps, nothing else
+    }
+
+    # Raw int64 nanosecond epochs for the binary .npz database
+    epochs = pred_times.view(np.int64)
+
+    return inverter_entry, epochs
+
+def process_inverter(source_key, date_times, ac_power, sequence_length):
+    """Compute the valid prediction timestamps for a single inverter's arrays"""
+    valid = (~np.isnan(ac_power)).view(np.uint8)
+
+    if len(ac_power) <= sequence_length:
+        pred_times = np.array([], dtype='datetime64[ns]')
+    elif NUMBA_AVAILABLE:
+        # Compiled single-pass running count of valid readings
+        pred_times = date_times[extract_valid_ends(valid, sequence_length)]
+    else:
+        # Branchless O(N) rolling count of valid readings: a window is fully
+        # valid exactly when its cumulative-sum difference equals its length,
+        # so each byte of the validity mask is touched once instead of
+        # sequence_length times
+        csum = np.cumsum(valid)
+        window_sums = csum[sequence_length - 1:] - np.concatenate(([0], csum[:-sequence_length]))
+        # Drop the last window: its prediction timestamp would fall past the data
+        mask = window_sums[:-1] == sequence_length
+        pred_times = date_times[sequence_length:][mask]
+
+    inverter_entry, epochs = build_inverter_entry(source_key, pred_times)
+
+    return str(source_key), inverter_entry, epochs
+
+def compute_prediction_timestamps_polars(plant_num, csv_file, sequence_length):
+    """Polars variant: the rolling validity windows for all inverters in one pass"""
+    df = pl.read_csv(csv_file, try_parse_dates=True).sort(['SOURCE_KEY', 'DATE_TIME'])
+    print(f"📊 Loaded {df.height:,} records")
+
+    all_keys = df['SOURCE_KEY'].unique().sort().to_list()
+    total_inverters = len(all_keys)
+    print(f"📋 Processing {total_inverters} inverters...")
+
+    # A row is a valid prediction time when the sequence_length rows before it
+    # are all non-null: rolling count of the validity flag, shifted by one row
+    valid = (
+        df.with_columns(
+            pl.col('AC_POWER').is_not_null().cast(pl.UInt8)
+              .rolling_sum(sequence_length).shift(1).over('SOURCE_KEY')
+              .alias('valid_count')
+        )
+        .filter(pl.col('valid_count') == sequence_length)
+        .group_by('SOURCE_KEY', maintain_order=True)
+        .agg(pl.col('DATE_TIME'))
+    )
+    per_inverter = dict(zip(valid['SOURCE_KEY'].to_list(), valid['DATE_TIME'].to_list()))
+
+    # Initialize compact database
+    compact_db = {
+        'plant': plant_num,
+        'generated_at': datetime.now().isoformat(),
+        'sequence_length': sequence_length,
+        'inverters': {}
+    }
+
+    total_timestamps = 0
+    epoch_arrays = {}
+
+    for i, source_key in enumerate(all_keys, 1):
+        print(f"   🔄 [{i:2d}/{total_inverters}] Processing {source_key}...")
+
+        inverter_entry, epochs = build_inverter_entry(source_key, per_inverter.get(source_key, []))
+
+        # Store only the essential information
+        compact_db['inverters'][str(source_key)] = inverter_entry
+        epoch_arrays[str(source_key)] = epochs
+
+        total_timestamps += inverter_entry['prediction_count']
+        print(f"      ✅ Found {inverter_entry['prediction_count']:,} prediction timestamps")
+
+    # Add summary
+    compact_db['summary'] = {
+        'total_inverters': total_inverters,
+        'total_prediction_timestamps': total_timestamps,
+        'average_per_inverter': round(total_timestamps / max(1, total_inverters), 1),
+        'date_range': {
+            'start': df['DATE_TIME'].min().isoformat(),
+            'end': df['DATE_TIME'].max().isoformat()
+        }
+    }
+
+    print("✅ Analysis complete!")
+    print(f"📊 Total prediction timestamps: {total_timestamps:,}")
+
+    return compact_db, epoch_arrays
+
 def compute_prediction_timestamps_compact(plant_num, sequence_length=24):
     """
     Compute only the timestamps when predictions are possible for each inverter.
@@ -22,17 +164,20 @@ def compute_prediction_timestamps_compact(plant_num, sequence_length=24):
     if not os.path.exists(csv_file):
         print(f"❌ File not found: {csv_file}")
         return None
-    
-    # Read the data
-    df = pd.read_csv(csv_file)
+
+    if POLARS_AVAILABLE:
+        print("⚡ Using polars for the rolling-window computation")
+        return compute_prediction_timestamps_polars(plant_num, csv_file, sequence_length)
+
+    # Read the data; the pyarrow engine parses the CSV with multiple threads
+    # and converts DATE_TIME to datetime in the same pass
+    df = pd.read_csv(csv_file, parse_dates=['DATE_TIME'], engine='pyarrow')
     print(f"📊 Loaded {len(df):,} records")
     
-    # Convert DATE_TIME to datetime
-    df['DATE_TIME'] = pd.to_datetime(df['DATE_TIME'])
-    
-    # Get unique inverters
-    unique_sources = sorted(df['SOURCE_KEY'].unique())
-    total_inverters = len(unique_sources)
+    # Sort once globally so each inverter's rows are contiguous and already
+    # in chronological order - avoids re-scanning the full dataframe per inverter
+    df = df.sort_values(['SOURCE_KEY', 'DATE_TIME']).reset_index(drop=True)
+    total_inverters = df['SOURCE_KEY'].nunique()
     print(f"📋 Processing {total_inverters} inverters...")
     
     # Initialize compact database
@@ -44,39 +189,35 @@ def compute_prediction_timestamps_compact(plant_num, sequence_length=24):
     }
     
     total_timestamps = 0
-    
-    for i, source_key in enumerate(unique_sources, 1):
-        print(f"   🔄 [{i:2d}/{total_inverters}] Processing {source_key}...")
-        
-        # Get data for this inverter only
-        inverter_df = df[df['SOURCE_KEY'] == source_key].copy()
-        inverter_df = inverter_df.sort_values('DATE_TIME').reset_index(drop=True)
-        
-        # Find valid prediction timestamps (just the dates)
-        prediction_timestamps = []
-        
-        for idx in range(len(inverter_df) - sequence_length):
-            # Check if we have a complete sequence of 24 valid readings
-            sequence_data = inverter_df.iloc[idx:idx + sequence_length]
-            
-            # Check if all AC_POWER values in sequence are valid (not NaN)
-            if sequence_data['AC_POWER'].notna().all():
-                # The prediction timestamp is right after the sequence
-                prediction_time = inverter_df.iloc[idx + sequence_length]['DATE_TIME']
-                prediction_timestamps.append(prediction_time.isoformat())
-        
-        # Store only the essential information
-        compact_db['inverters'][str(source_key)] = {
-            'inverter_id': int(source_key),
-            'prediction_count': len(prediction_timestamps),
-            'first_prediction': prediction_timestamps[0] if prediction_timestamps else None,
-            'last_prediction': prediction_timestamps[-1] if prediction_timestamps else None,
-            'timestamps': prediction_timestamps  # Just the timestamps, nothing else
-        }
-        
-        total_timestamps += len(prediction_timestamps)
-        print(f"      ✅ Found {len(prediction_timestamps):,} prediction timestamps")
-    
+    epoch_arrays = {}
+
+    # Each inverter is independent, so fan the per-inverter work out across cores.
+    # A prediction is possible right after any window of sequence_length
+    # consecutive non-NaN AC_POWER readings; process_inverter computes the
+    # whole mask in one vectorized pass per inverter.
+    with ProcessPoolExecutor() as executor:
+        futures = []
+        for source_key, inverter_df in df.groupby('SOURCE_KEY', sort=False):
+            futures.append((source_key, executor.submit(
+                process_inverter,
+                source_key,
+                inverter_df['DATE_TIME'].to_numpy(),
+                inverter_df['AC_POWER'].to_numpy(),
+                sequence_length
+            )))
+
+        for i, (source_key, future) in enumerate(futures, 1):
+            print(f"   🔄 [{i:2d}/{total_inverters}] Processing {source_key}...")
+
+            key, inverter_entry, epochs = future.result()
+
+            # Store only the essential information
+            compact_db['inverters'][key] = inverter_entry
+            epoch_arrays[key] = epochs
+
+            total_timestamps += inverter_entry['prediction_count']
+            print(f"      ✅ Found {inverter_entry['prediction_count']:,} prediction timestamps")
+
     # Add summary
     compact_db['summary'] = {
         'total_inverters': total_inverters,
@@ -90,8 +231,8 @@ def compute_prediction_timestamps_compact(plant_num, sequence_length=24):
     
     print("✅ Analysis complete!")
     print(f"📊 Total prediction timestamps: {total_timestamps:,}")
-    
-    return compact_db
+
+    return compact_db, epoch_arrays
 
 def save_compact_database(compact_db, plant_num):
     """Save the compact prediction database"""
@@ -104,7 +245,19 @@ def save_compact_database(compact_db, plant_num):
     
     file_size_kb = os.path.getsize(filename) / 1024
     print(f"   📁 Saved: {filename} ({file_size_kb:.1f} KB)")
-    
+
+    return filename
+
+def save_epoch_arrays(epoch_arrays, plant_num):
+    """Save the timestamps as int64 nanosecond arrays for O(log n) API lookups"""
+
+    filename = f"ML/prediction_timestamps_plant_{plant_num}.npz"
+
+    np.savez_compressed(filename, **epoch_arrays)
+
+    file_size_kb = os.path.getsize(filename) / 1024
+    print(f"   📁 Saved: {filename} ({file_size_kb:.1f} KB)")
+
     return filename
 
 def print_compact_summary(compact_db):
@@ -149,15 +302,18 @@ def main():
         
         try:
             # Compute compact timestamps
-            compact_db = compute_prediction_timestamps_compact(plant_num)
-            
-            if compact_db:
+            result = compute_prediction_timestamps_compact(plant_num)
+
+            if result:
+                compact_db, epoch_arrays = result
+
                 # Print summary
                 print_compact_summary(compact_db)
-                
-                # Save to file
+
+                # Save to file (JSON for the API, npz epochs for fast validation)
                 filename = save_compact_database(compact_db, plant_num)
-                
+                save_epoch_arrays(epoch_arrays, plant_num)
+
                 print(f"\n✅ Plant {plant_num} processing complete!")
                 print(f"   📁 Use {filename} for API timestamp lookups")
             else:
@@ -1,6 +1,12 @@
 from influxdb_client_3 import InfluxDBClient3
+import numpy as np
+import os
 import pandas as pd
 
+# Points per write request; per-request HTTP overhead dominates ingestion
+# throughput, so submit the data in large batches
+BATCH_SIZE = int(os.environ.get("INFLUX_BATCH_SIZE", "10000"))
+
 client = InfluxDBClient3(
     host="http://127.0.0.1:8181",
     token="apiv3_7yspe-v_XcKVaJGo4IEyAZxL_g_SMK_6iQeb2tODrMlvKYj9cnaSYO6ut-Wbs1MWTFfxfjBJj0LoRK2oBw-Nsg",
@@ -12,15 +18,18 @@ client = InfluxDBClient3(
 print("Connection Successful!")
 
 # plant_id and source_key (only in the weather sensor files) are redundant, so we drop them
-plant1_generation = pd.read_csv("data/Plant_1_Generation_Data.csv", 
-                                parse_dates=["DATE_TIME"], dayfirst=True)
-plant1_weather = pd.read_csv("data/Plant_1_Weather_Sensor_Data.csv", 
-                                parse_dates=["DATE_TIME"]).drop(columns=["PLANT_ID","SOURCE_KEY"])
+# read with the multithreaded pyarrow engine; plant 1 generation data uses
+# day-first dates which pyarrow can't infer, so parse that column explicitly
+plant1_generation = pd.read_csv("data/Plant_1_Generation_Data.csv", engine="pyarrow")
+plant1_generation["DATE_TIME"] = pd.to_datetime(plant1_generation["DATE_TIME"],
+                                format="%d-%m-%Y %H:%M")
+plant1_weather = pd.read_csv("data/Plant_1_Weather_Sensor_Data.csv",
+                                parse_dates=["DATE_TIME"], engine="pyarrow").drop(columns=["PLANT_ID","SOURCE_KEY"])
 
-plant2_generation = pd.read_csv("data/Plant_2_Generation_Data.csv", 
-                                parse_dates=["DATE_TIME"])
-plant2_weather = pd.read_csv("data/Plant_2_Weather_Sensor_Data.csv", 
-                                parse_dates=["DATE_TIME"]).drop(columns=["PLANT_ID","SOURCE_KEY"])
+plant2_generation = pd.read_csv("data/Plant_2_Generation_Data.csv",
+                                parse_dates=["DATE_TIME"], engine="pyarrow")
+plant2_weather = pd.read_csv("data/Plant_2_Weather_Sensor_Data.csv",
+                                parse_dates=["DATE_TIME"], engine="pyarrow").drop(columns=["PLANT_ID","SOURCE_KEY"])
 
 plant1 = pd.merge(plant1_generation, plant1_weather, on="DATE_TIME")
 plant2 = pd.merge(plant2_generation, plant2_weather, on="DATE_TIME")
@@ -53,15 +62,68 @@ plant2 = plant2.drop(columns=["PLANT_ID"])
 plant1.to_csv("data/plant1_final.csv")
 plant2.to_csv("data/plant2_final.csv")
 
+def save_scaler_params(plant, plant_num):
+    """Precompute MinMax scaler parameters so the API never has to refit at startup"""
+    # same cyclical encoding as the notebook / prediction router
+    time_of_day = plant.index.hour + plant.index.minute / 60
+    day_of_year = plant.index.dayofyear
+
+    features = pd.DataFrame({
+        "DC_POWER": plant["DC_POWER"],
+        "AMBIENT_TEMPERATURE": plant["AMBIENT_TEMPERATURE"],
+        "MODULE_TEMPERATURE": plant["MODULE_TEMPERATURE"],
+        "IRRADIATION": plant["IRRADIATION"],
+        "hour_sin": np.sin(2 * np.pi * time_of_day / 24),
+        "hour_cos": np.cos(2 * np.pi * time_of_day / 24),
+        "day_sin": np.sin(2 * np.pi * day_of_year / 365),
+        "day_cos": np.cos(2 * np.pi * day_of_year / 365),
+    })
+
+    np.savez(f"ML/scalers_plant{plant_num}.npz",
+             feature_min=features.min().to_numpy(dtype=np.float32),
+             feature_max=features.max().to_numpy(dtype=np.float32),
+             target_min=np.float32(plant["AC_POWER"].min()),
+             target_max=np.float32(plant["AC_POWER"].max()))
+    print(f"Saved scaler parameters for plant {plant_num}")
+
+save_scaler_params(plant1, 1)
+save_scaler_params(plant2, 2)
+
+def write_plant_batched(plant, measurement):
+    """Write a plant dataframe as line-protocol batches instead of one huge request"""
+    field_cols = [c for c in plant.columns if c != "SOURCE_KEY"]
+    timestamps = plant.index.asi8  # nanosecond epochs
+    source_keys = plant["SOURCE_KEY"].to_numpy()
+    field_values = plant[field_cols].to_numpy()
+
+    lines = []
+    for ts, key, values in zip(timestamps, source_keys, field_values):
+        # NaN fields (missing readings) are simply omitted from the point
+        fields = ",".join(f"{col}={val}" for col, val in zip(field_cols, values) if val == val)
+        lines.append(f"{measurement},SOURCE_KEY={key} {fields} {ts}")
+
+    for start in range(0, len(lines), BATCH_SIZE):
+        client.write(record=lines[start:start + BATCH_SIZE])
+        print(f"  {measurement}: wrote {min(start + BATCH_SIZE, len(lines)):,}/{len(lines):,} points")
+
+def write_hourly_rollup(plant, measurement):
+    """Write a 1-hour mean rollup so long-range API queries avoid the raw 15-min data"""
+    hourly = (plant.groupby([pd.Grouper(freq="1h"), "SOURCE_KEY"])
+                   .mean()
+                   .reset_index(level="SOURCE_KEY"))
+    write_plant_batched(hourly, f"{measurement}_1h")
+
 # write the dataframes to influxdb3
 try:
-    client.write(plant1, data_frame_measurement_name="plant1", data_frame_tag_columns=["SOURCE_KEY"])
+    write_plant_batched(plant1, "plant1")
+    write_hourly_rollup(plant1, "plant1")
     print("DataFrame successfully written to InfluxDB!")
 except Exception as e:
     print(f"Failed to write to InfluxDB: {e}")
 
 try:
-    client.write(plant2, data_frame_measurement_name="plant2", data_frame_tag_columns=["SOURCE_KEY"])
+    write_plant_batched(plant2, "plant2")
+    write_hourly_rollup(plant2, "plant2")
     print("DataFrame successfully written to InfluxDB!")
 except Exception as e:
     print(f"Failed to write to InfluxDB: {e}")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Export the served Keras models to ONNX for fast batch-1 CPU inference.
+Run this offline after (re)training; the prediction router automatically
+prefers the .onnx file next to each .keras model when onnxruntime is
+installed. Requires tensorflow and tf2onnx:
+
+    pip install tf2onnx
+"""
+
+import os
+import tensorflow as tf
+import tf2onnx
+
+# Only the models the API actually serves
+SERVED_MODELS = [
+    "ML/Plant1_inverter_Model_V2.keras",
+    "ML/Plant2_inverter_Model.keras"
+]
+
+def export_onnx(model_path):
+    """Convert a single Keras model to ONNX next to the original file"""
+    onnx_path = model_path.replace('.keras', '.onnx')
+
+    print(f"🔄 Converting {model_path} -> {onnx_path}")
+    model = tf.keras.models.load_model(model_path, compile=False)
+    tf2onnx.convert.from_keras(model, opset=15, output_path=onnx_path)
+
+    file_size_kb = os.path.getsize(onnx_path) / 1024
+    print(f"   ✅ Saved {onnx_path} ({file_size_kb:.1f} KB)")
+
+def export_tflite(model_path):
+    """Convert a single Keras model to TFLite (XNNPACK kernels at serve time)"""
+    tflite_path = model_path.replace('.keras', '.tflite')
+
+    print(f"🔄 Converting {model_path} -> {tflite_path}")
+    model = tf.keras.models.load_model(model_path, compile=False)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    with open(tflite_path, 'wb') as f:
+        f.write(converter.convert())
+
+    file_size_kb = os.path.getsize(tflite_path) / 1024
+    print(f"   ✅ Saved {tflite_path} ({file_size_kb:.1f} KB)")
+
+def main():
+    print("🚀 EXPORTING SERVING MODELS TO ONNX / TFLITE")
+    print("=" * 60)
+
+    for model_path in SERVED_MODELS:
+        if os.path.exists(model_path):
+            export_onnx(model_path)
+            export_tflite(model_path)
+        else:
+            print(f"❌ Model not found: {model_path}")
+
+    print("🎉 Export complete!")
+
+if __name__ == "__main__":
+    main()
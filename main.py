@@ -1,8 +1,16 @@
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from influxdb_client_3 import InfluxDBClient3
 
-# Initialize InfluxDB client 
+# All endpoints funnel their blocking queries through run_query in
+# routers/common.py, which holds an asyncio.Semaphore of this size;
+# INFLUX_MAX_QUERIES caps how many queries run in parallel before the rest
+# queue in the event loop. The default of 16 covers the frontend's fan-out.
+MAX_CONCURRENT_QUERIES = int(os.environ.get("INFLUX_MAX_QUERIES", "16"))
+
+# Initialize InfluxDB client
 client = None
 try:
     client = InfluxDBClient3(
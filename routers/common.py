@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from fastapi import Response
+import orjson
+import pyarrow as pa
+from main import MAX_CONCURRENT_QUERIES, client
+
+# Created lazily inside the running event loop on first use so the semaphore
+# is bound to the loop uvicorn actually serves from
+_query_semaphore = None
+
+async def run_query(func, *args, **kwargs):
+    """Run a blocking query callable on a thread, capped by the semaphore.
+
+    At most MAX_CONCURRENT_QUERIES calls execute at once across all
+    endpoints; the excess awaits here in the event loop instead of piling
+    worker threads onto the database.
+    """
+    global _query_semaphore
+    if _query_semaphore is None:
+        _query_semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    async with _query_semaphore:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+# Whether the hourly rollup measurement (plant{N}_1h) exists, probed lazily
+# per plant and cached. Installs whose database was ingested before the
+# rollup was added to data_prep.py don't have it until a re-ingest, so long
+# ranges fall back to the raw measurement instead of failing
+rollup_cache = {}
+
+def rollup_available(plant):
+    """True when plant{N}_1h exists; probed once per plant. Blocking."""
+    cached = rollup_cache.get(plant)
+    if cached is None:
+        try:
+            client.query(query=f"SELECT time FROM plant{plant}_1h LIMIT 1",
+                         language="sql", mode="pandas")
+            cached = True
+        except Exception:
+            cached = False
+        rollup_cache[plant] = cached
+    return cached
+
+# Columns the frontend actually consumes (simulation/main.js) plus DC_POWER
+# for the power charts; DAILY_YIELD and TOTAL_YIELD are never read client-side
+# so projecting them out shrinks every replay/panel response
+QUERY_COLUMNS = ('time, "SOURCE_KEY", "DC_POWER", "AC_POWER", '
+                 '"AMBIENT_TEMPERATURE", "MODULE_TEMPERATURE", "IRRADIATION"')
+
+def parse_timestamp(value):
+    """Parse an ISO timestamp (space or T separator, optional Z) as UTC.
+
+    datetime.fromisoformat is an order of magnitude cheaper than the
+    format-guessing pd.to_datetime for the fixed layouts the frontend
+    sends; naive inputs are taken as UTC. Raises ValueError on bad input.
+    """
+    ts = datetime.fromisoformat(value.replace(" ", "T").replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts
+
+def parse_range(start, end):
+    """Parse both range bounds as UTC datetimes"""
+    return parse_timestamp(start), parse_timestamp(end)
+
+def range_parameters(start_ts, end_ts):
+    """Bind values for the half-open range templates (time >= start, time < end).
+
+    The end bound is nudged forward by one microsecond (datetime resolution;
+    the data is 15-minute) so the row exactly at the user-supplied end
+    timestamp stays included - deliberately preserving the inclusive-end
+    semantics the frontend has always relied on, so two windows that share a
+    boundary timestamp both return that row, exactly as the old <= did.
+    """
+    return {"start": start_ts.isoformat(),
+            "end": (end_ts + timedelta(microseconds=1)).isoformat()}
+
+def json_default(obj):
+    # pandas Timestamps are datetime subclasses, which orjson refuses natively
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def arrow_response(table):
+    """Serialize a pyarrow Table as an Arrow IPC stream - no pandas or JSON step"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(
+        content=sink.getvalue().to_pybytes(),
+        media_type="application/vnd.apache.arrow.stream"
+    )
+
+def records_bytes(result):
+    """Serialize a query result frame as JSON records bytes via orjson"""
+    return orjson.dumps(result.to_dict(orient="records"),
+                        option=orjson.OPT_SERIALIZE_NUMPY,
+                        default=json_default)
+
+def records_response(result):
+    """Serialize a query result frame as a JSON records array via orjson"""
+    return Response(content=records_bytes(result), media_type="application/json")
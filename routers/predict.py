@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Query, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
 import os
 import json
+import threading
+import orjson
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from sklearn.preprocessing import MinMaxScaler
+from datetime import datetime
 
 # TensorFlow imports
 try:
@@ -15,12 +17,35 @@ except ImportError as e:
     TF_AVAILABLE = False
     tf = None
 
+# ONNX Runtime is preferred for serving when an exported model is available
+# (see export_models.py); batch-1 LSTM inference is much faster there than
+# through the TF eager path
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+    ort = None
+
 router = APIRouter(
     prefix="/predict",
     tags=["predict"],
     responses={404: {"description": "Not found"}},
 )
 
+# Cyclical time encodings only depend on the 15-minute slot (96 per day) and
+# the day of year, so precompute them once as lookup tables
+_PHASE_TOD = 2 * np.pi * np.arange(96) / 96
+_PHASE_DOY = 2 * np.pi * np.arange(367) / 365
+HOUR_SIN_LUT, HOUR_COS_LUT = np.sin(_PHASE_TOD), np.cos(_PHASE_TOD)
+DAY_SIN_LUT, DAY_COS_LUT = np.sin(_PHASE_DOY), np.cos(_PHASE_DOY)
+
+# Feature columns fed to the LSTM, in model input order (same as in notebook)
+FEATURE_COLUMNS = [
+    'DC_POWER', 'AMBIENT_TEMPERATURE', 'MODULE_TEMPERATURE', 'IRRADIATION',
+    'hour_sin', 'hour_cos', 'day_sin', 'day_cos'
+]
+
 # Global variables for model storage
 loaded_models = {}
 loaded_scalers = {}
@@ -28,135 +53,287 @@ loaded_scalers = {}
 # Cache for loaded data
 data_cache = {}
 
+# Per-inverter (timestamps_ns, feature matrix) arrays for O(log N) sequence lookup
+inverter_arrays = {}
+
+# Parsed prediction-timestamp databases, loaded once per plant
+timestamp_db = {}
+
+def get_timestamp_db(plant):
+    """Load and cache the prediction-timestamp database for a plant"""
+    if plant in timestamp_db:
+        return timestamp_db[plant]
+
+    timestamp_file = f"ML/prediction_timestamps_plant_{plant}.json"
+
+    if not os.path.exists(timestamp_file):
+        return None
+
+    # orjson parses the multi-MB file several times faster than stdlib json
+    with open(timestamp_file, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    timestamp_db[plant] = data
+    return data
+
+# Int64 nanosecond epoch arrays per inverter, for O(log n) timestamp validation
+timestamp_epochs = {}
+
+def get_timestamp_epochs(plant):
+    """Load and cache the int64 epoch arrays written by compact_prediction_analysis.py"""
+    if plant in timestamp_epochs:
+        return timestamp_epochs[plant]
+
+    npz_file = f"ML/prediction_timestamps_plant_{plant}.npz"
+
+    epochs = dict(np.load(npz_file)) if os.path.exists(npz_file) else None
+    timestamp_epochs[plant] = epochs
+    return epochs
+
+# Per-inverter timestamp sets for O(1) membership when the npz is absent
+timestamp_sets = {}
+
+def is_valid_prediction_timestamp(plant, inverter, timestamp):
+    """Check whether a timestamp is predictable for an inverter (O(log n) / O(1))"""
+    epochs = get_timestamp_epochs(plant)
+    if epochs is not None and inverter in epochs:
+        arr = epochs[inverter]
+        ts_ns = pd.Timestamp(timestamp).value
+        pos = np.searchsorted(arr, ts_ns)
+        return bool(pos < len(arr) and arr[pos] == ts_ns)
+
+    if plant not in timestamp_sets:
+        data = get_timestamp_db(plant)
+        timestamp_sets[plant] = {
+            inv: set(entry["timestamps"]) for inv, entry in data["inverters"].items()
+        } if data else {}
+
+    return timestamp in timestamp_sets[plant].get(inverter, ())
+
 def load_model(model_path):
-    """Load a single model file"""
-    if not TF_AVAILABLE:
-        raise ImportError("TensorFlow is not available")
-    
+    """Load a single model file, preferring an exported ONNX session"""
     if model_path in loaded_models:
         return loaded_models[model_path]
-    
+
+    # Prefer the ONNX export next to the Keras file when onnxruntime is there
+    onnx_path = model_path.replace('.keras', '.onnx')
+    if ORT_AVAILABLE and os.path.exists(onnx_path):
+        try:
+            sess_options = ort.SessionOptions()
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = ort.InferenceSession(onnx_path, sess_options,
+                                           providers=['CPUExecutionProvider'])
+            loaded_models[model_path] = ('onnx', session)
+            return loaded_models[model_path]
+        except Exception:
+            pass  # Fall back to the TFLite / Keras paths below
+
+    if not TF_AVAILABLE:
+        raise ImportError("TensorFlow is not available")
+
+    # A TFLite export runs through XNNPACK SIMD kernels instead of the
+    # Python-heavy TF graph executor
+    tflite_path = model_path.replace('.keras', '.tflite')
+    if os.path.exists(tflite_path):
+        try:
+            interpreter = tf.lite.Interpreter(model_path=tflite_path)
+            interpreter.allocate_tensors()
+            loaded_models[model_path] = ('tflite', interpreter)
+            return loaded_models[model_path]
+        except Exception:
+            pass  # Fall back to the Keras model below
+
     try:
         model = tf.keras.models.load_model(model_path, compile=False)
-        loaded_models[model_path] = model
-        return model
+        loaded_models[model_path] = ('keras', model)
+        return loaded_models[model_path]
     except Exception as e:
         raise RuntimeError(f"Failed to load model {model_path}: {str(e)}")
 
+# TFLite interpreters are not thread-safe, and the prediction endpoints run
+# on FastAPI's thread pool, so the whole resize/set_tensor/invoke/get_tensor
+# sequence is serialized; ONNX sessions and Keras models handle concurrent
+# calls themselves
+tflite_lock = threading.Lock()
+
+def run_model(model_entry, X):
+    """Run one forward pass through whichever runtime backs the model"""
+    runtime, model = model_entry
+    if runtime == 'onnx':
+        input_name = model.get_inputs()[0].name
+        return model.run(None, {input_name: X.astype(np.float32)})[0]
+    if runtime == 'tflite':
+        with tflite_lock:
+            input_detail = model.get_input_details()[0]
+            output_detail = model.get_output_details()[0]
+            if tuple(input_detail['shape']) != X.shape:
+                model.resize_tensor_input(input_detail['index'], X.shape)
+                model.allocate_tensors()
+                input_detail = model.get_input_details()[0]
+            model.set_tensor(input_detail['index'], X.astype(np.float32))
+            model.invoke()
+            return model.get_tensor(output_detail['index'])
+    return model.predict(X, verbose=0)
+
 def load_plant_data(plant):
     """Load and cache plant data with preprocessing"""
     cache_key = f"plant_{plant}"
     
     if cache_key in data_cache:
         return data_cache[cache_key]
-    
+
+    # Fully-processed data is persisted as Parquet after the first build, so
+    # later cold starts skip CSV parsing and feature recomputation entirely
+    parquet_file = f"data/plant{plant}_prepared.parquet"
+
+    if os.path.exists(parquet_file):
+        df = pd.read_parquet(parquet_file, engine='pyarrow')
+        data_cache[cache_key] = df
+        return df
+
     # Load the appropriate CSV file
     csv_file = f"data/plant{plant}_final.csv"
-    
+
     if not os.path.exists(csv_file):
         raise FileNotFoundError(f"Data file {csv_file} not found")
-    
-    # Load and preprocess data
-    df = pd.read_csv(csv_file)
-    df['DATE_TIME'] = pd.to_datetime(df['DATE_TIME'])
-    
-    # Cyclical encoding of timestamps (same as in the notebook)
-    df['hour'] = df['DATE_TIME'].dt.hour
-    df['minute'] = df['DATE_TIME'].dt.minute
-    df['time_of_day'] = df['hour'] + df['minute']/60
-    df['hour_sin'] = np.sin(2 * np.pi * df['time_of_day'] / 24)
-    df['hour_cos'] = np.cos(2 * np.pi * df['time_of_day'] / 24)
-    df['day_of_year'] = df['DATE_TIME'].dt.dayofyear
-    df['day_sin'] = np.sin(2 * np.pi * df['day_of_year'] / 365)
-    df['day_cos'] = np.cos(2 * np.pi * df['day_of_year'] / 365)
-    
-    # Drop intermediate columns
-    df = df.drop(columns=['hour', 'minute', 'time_of_day', 'day_of_year'])
-    
+
+    # Load and preprocess data; the pyarrow engine parses the CSV with
+    # multiple threads and converts DATE_TIME to datetime in the same pass
+    df = pd.read_csv(csv_file, parse_dates=['DATE_TIME'], engine='pyarrow')
+
+    # Cyclical encoding of timestamps (same values as the notebook computes),
+    # taken from the precomputed lookup tables instead of materializing
+    # intermediate columns and per-row trig
+    dt = df['DATE_TIME'].dt
+    slots = (dt.hour * 4 + dt.minute // 15).to_numpy()
+    days = dt.dayofyear.to_numpy()
+    df['hour_sin'] = HOUR_SIN_LUT[slots]
+    df['hour_cos'] = HOUR_COS_LUT[slots]
+    df['day_sin'] = DAY_SIN_LUT[days]
+    df['day_cos'] = DAY_COS_LUT[days]
+
+    # Sort once so per-inverter rows are contiguous and chronological;
+    # consumers can then slice groups without re-sorting
+    df = df.sort_values(['SOURCE_KEY', 'DATE_TIME']).reset_index(drop=True)
+
+    # Persist for the next cold start
+    try:
+        df.to_parquet(parquet_file, engine='pyarrow', compression='zstd')
+    except Exception:
+        pass  # Cache file is an optimization only, keep serving from memory
+
     # Cache the processed data
     data_cache[cache_key] = df
     return df
 
 def get_or_create_scalers(plant):
-    """Get or create scalers for a specific plant"""
+    """Get or create MinMax scaler parameters for a specific plant"""
     scaler_key = f"plant_{plant}"
-    
+
     if scaler_key in loaded_scalers:
         return loaded_scalers[scaler_key]
-    
-    # Load plant data to fit scalers
-    df = load_plant_data(plant)
-    
+
     # Features and target (same as in notebook)
-    features = [
-        'DC_POWER', 'AMBIENT_TEMPERATURE', 'MODULE_TEMPERATURE', 'IRRADIATION',
-        'hour_sin', 'hour_cos', 'day_sin', 'day_cos'
-    ]
+    features = FEATURE_COLUMNS
     target = 'AC_POWER'
-    
-    # Create and fit scalers
-    scaler_features = MinMaxScaler()
-    scaler_target = MinMaxScaler()
-    
-    scaler_features.fit(df[features])
-    scaler_target.fit(df[[target]])
-    
+
+    # Prefer the parameters persisted by data_prep.py; fall back to a single
+    # min/max pass over the plant data if the file is not there
+    scaler_file = f"ML/scalers_plant{plant}.npz"
+
+    if os.path.exists(scaler_file):
+        params = np.load(scaler_file)
+        feature_min = params['feature_min']
+        feature_max = params['feature_max']
+        target_min = float(params['target_min'])
+        target_max = float(params['target_max'])
+    else:
+        df = load_plant_data(plant)
+        feature_min = df[features].min().to_numpy(dtype=np.float32)
+        feature_max = df[features].max().to_numpy(dtype=np.float32)
+        target_min = float(df[target].min())
+        target_max = float(df[target].max())
+
+    # MinMax scaling: (x - min) * scale, inverse: y / scale + min
+    feature_range = feature_max - feature_min
+    feature_range[feature_range == 0] = 1.0
+    target_range = (target_max - target_min) or 1.0
+
     scalers = {
-        'features': scaler_features,
-        'target': scaler_target,
+        'feature_min': feature_min,
+        'feature_scale': np.float32(1.0) / feature_range,
+        'target_min': target_min,
+        'target_scale': 1.0 / target_range,
         'feature_columns': features
     }
-    
+
     # Cache the scalers
     loaded_scalers[scaler_key] = scalers
     return scalers
 
+def get_inverter_arrays(plant):
+    """Get or build per-inverter (timestamps_ns, scaled feature matrix) arrays for a plant"""
+    cache_key = f"plant_{plant}"
+
+    if cache_key in inverter_arrays:
+        return inverter_arrays[cache_key]
+
+    # Plant data is already sorted by (SOURCE_KEY, DATE_TIME), so each group
+    # is a contiguous chronological slice
+    df = load_plant_data(plant)
+    scalers = get_or_create_scalers(plant)
+
+    arrays = {}
+    for source_key, group in df.groupby('SOURCE_KEY', sort=False):
+        # Scale once at build time: request handling then only slices a
+        # contiguous float32 block (24 x 8 floats, fits in L1)
+        features = group[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+        scaled = np.ascontiguousarray(
+            (features - scalers['feature_min']) * scalers['feature_scale'],
+            dtype=np.float32
+        )
+        arrays[int(source_key)] = (
+            group['DATE_TIME'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+            scaled
+        )
+
+    inverter_arrays[cache_key] = arrays
+    return arrays
+
 def prepare_sequence_for_prediction(plant, inverter, prediction_timestamp):
     """Prepare a 24-hour sequence for prediction"""
-    # Load plant data
-    df = load_plant_data(plant)
-    
-    # Filter data for the specific inverter
-    inverter_df = df[df['SOURCE_KEY'] == int(inverter)]
-    
-    if inverter_df.empty:
+    arrays = get_inverter_arrays(plant)
+
+    entry = arrays.get(int(inverter))
+    if entry is None:
         raise ValueError(f"No data found for inverter {inverter} in plant {plant}")
-    
-    # Convert prediction timestamp to datetime
-    pred_time = pd.to_datetime(prediction_timestamp)
-    
-    # Get 24 hours of data before the prediction timestamp (sequence_length = 24)
-    start_time = pred_time - timedelta(hours=6)  # 6 hours before to get 24 15-minute intervals
-    
-    # Filter data for the sequence window
-    sequence_df = inverter_df[
-        (inverter_df['DATE_TIME'] >= start_time) & 
-        (inverter_df['DATE_TIME'] < pred_time)
-    ].sort_values('DATE_TIME')
-    
-    if len(sequence_df) < 24:
-        raise ValueError(f"Insufficient historical data for prediction. Need 24 data points, got {len(sequence_df)}")
-    
-    # Take the last 24 data points
-    sequence_df = sequence_df.tail(24)
-    
-    # Get scalers
+
+    timestamps_ns, feature_matrix = entry
+
+    # Binary search for the prediction timestamp instead of a range filter + sort
+    pred_ns = pd.Timestamp(prediction_timestamp).value
+    idx = np.searchsorted(timestamps_ns, pred_ns)
+
+    if idx < 24:
+        raise ValueError(f"Insufficient historical data for prediction. Need 24 data points, got {idx}")
+
+    # The 24 readings immediately before the prediction timestamp; the matrix
+    # is already scaled, so this is a pure contiguous slice
+    sequence = feature_matrix[idx - 24:idx]
+
+    # Scalers are still returned for the target inverse transform
     scalers = get_or_create_scalers(plant)
-    
-    # Scale the features
-    features = scalers['feature_columns']
-    scaled_features = scalers['features'].transform(sequence_df[features])
-    
+
     # Reshape for LSTM input (1, sequence_length, n_features)
-    X = scaled_features.reshape(1, 24, len(features))
-    
+    X = sequence.reshape(1, 24, len(FEATURE_COLUMNS))
+
     return X, scalers
 
 def load_all_models():
     """Load the required inverter models"""
-    if not TF_AVAILABLE:
+    if not (TF_AVAILABLE or ORT_AVAILABLE):
         return
-    
+
     # Define only the inverter models we need
     model_files = [
         "ML/Plant1_inverter_Model_V2.keras",  # Use V2 for Plant 1
@@ -173,9 +350,10 @@ def load_all_models():
 @router.get("/")
 def predict_root():
     return {
-        "message": "Predict endpoint ready", 
+        "message": "Predict endpoint ready",
         "tensorflow_available": TF_AVAILABLE,
-        "loaded_models": len(loaded_models) if TF_AVAILABLE else 0
+        "onnxruntime_available": ORT_AVAILABLE,
+        "loaded_models": len(loaded_models)
     }
 
 @router.get("/timestamps")
@@ -187,35 +365,34 @@ def get_prediction_timestamps(plant: str = Query(..., description="Plant number
     if plant not in ["1", "2"]:
         raise HTTPException(status_code=400, detail="Plant must be 1 or 2")
     
-    # Load the appropriate timestamp file
-    timestamp_file = f"ML/prediction_timestamps_plant_{plant}.json"
-    
-    if not os.path.exists(timestamp_file):
-        raise HTTPException(status_code=404, detail=f"Timestamp file not found for plant {plant}")
-    
     try:
-        with open(timestamp_file, 'r') as f:
-            data = json.load(f)
-        
+        # Use the in-process database, parsed once per plant
+        data = get_timestamp_db(plant)
+
+        if data is None:
+            raise HTTPException(status_code=404, detail=f"Timestamp file not found for plant {plant}")
+
         # Check if inverter exists
         if inverter not in data["inverters"]:
             available_inverters = list(data["inverters"].keys())
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail=f"Inverter {inverter} not found for plant {plant}. Available inverters: {available_inverters}"
             )
-        
+
         inverter_data = data["inverters"][inverter]
-        
-        return {
+
+        # ORJSONResponse serializes the large timestamp list several times
+        # faster than the default json encoder
+        return ORJSONResponse({
             "plant": plant,
             "inverter": inverter,
             "prediction_count": inverter_data["prediction_count"],
             "first_prediction": inverter_data["first_prediction"],
             "last_prediction": inverter_data["last_prediction"],
             "timestamps": inverter_data["timestamps"]
-        }
-        
+        })
+
     except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail="Error reading timestamp file")
     except FileNotFoundError:
@@ -233,9 +410,9 @@ def generate_prediction(plant: str = Query(..., description="Plant number (1 or
     if plant not in ["1", "2"]:
         raise HTTPException(status_code=400, detail="Plant must be 1 or 2")
     
-    # Check if TensorFlow is available
-    if not TF_AVAILABLE:
-        raise HTTPException(status_code=503, detail="TensorFlow is not available for predictions")
+    # Check that at least one inference runtime is available
+    if not (TF_AVAILABLE or ORT_AVAILABLE):
+        raise HTTPException(status_code=503, detail="No inference runtime is available for predictions")
     
     # Validate timestamp format
     try:
@@ -243,16 +420,13 @@ def generate_prediction(plant: str = Query(..., description="Plant number (1 or
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid timestamp format. Use ISO format like '2020-06-17T23:45:00'")
     
-    # Load the appropriate timestamp file to validate the timestamp
-    timestamp_file = f"ML/prediction_timestamps_plant_{plant}.json"
-    
-    if not os.path.exists(timestamp_file):
-        raise HTTPException(status_code=404, detail=f"Timestamp file not found for plant {plant}")
-    
     try:
-        with open(timestamp_file, 'r') as f:
-            data = json.load(f)
-        
+        # Validate against the in-process timestamp database
+        data = get_timestamp_db(plant)
+
+        if data is None:
+            raise HTTPException(status_code=404, detail=f"Timestamp file not found for plant {plant}")
+
         # Check if inverter exists
         if inverter not in data["inverters"]:
             available_inverters = list(data["inverters"].keys())
@@ -262,10 +436,9 @@ def generate_prediction(plant: str = Query(..., description="Plant number (1 or
             )
         
         # Validate that the timestamp is available for prediction
-        inverter_data = data["inverters"][inverter]
-        if timestamp not in inverter_data["timestamps"]:
+        if not is_valid_prediction_timestamp(plant, inverter, timestamp):
             raise HTTPException(
-                status_code=400, 
+                status_code=400,
                 detail=f"Timestamp {timestamp} is not available for prediction. Use /predict/timestamps to get valid timestamps."
             )
         
@@ -277,17 +450,17 @@ def generate_prediction(plant: str = Query(..., description="Plant number (1 or
             raise HTTPException(status_code=503, detail=f"Model for plant {plant} is not loaded")
         
         # Get the model
-        model = loaded_models[model_file]
-        
+        model_entry = loaded_models[model_file]
+
         try:
             # Prepare the input sequence for prediction
             X, scalers = prepare_sequence_for_prediction(plant, inverter, timestamp)
-            
+
             # Make prediction using the loaded model
-            prediction_scaled = model.predict(X, verbose=0)
+            prediction_scaled = run_model(model_entry, X)
             
             # Inverse transform to get actual AC_POWER value
-            predicted_ac_power = scalers['target'].inverse_transform(prediction_scaled)[0][0]
+            predicted_ac_power = prediction_scaled[0][0] / scalers['target_scale'] + scalers['target_min']
             
             # Ensure non-negative values (AC power cannot be negative)
             predicted_ac_power = max(0.0, float(predicted_ac_power))
@@ -316,6 +489,88 @@ def generate_prediction(plant: str = Query(..., description="Plant number (1 or
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+class BatchPredictionItem(BaseModel):
+    inverter: str
+    timestamp: str
+
+class BatchPredictionRequest(BaseModel):
+    plant: str
+    items: list[BatchPredictionItem]
+
+@router.post("/generate_batch")
+def generate_prediction_batch(request: BatchPredictionRequest):
+    """Generate predictions for several (inverter, timestamp) pairs in one forward pass"""
+    plant = request.plant
+
+    # Validate plant parameter
+    if plant not in ["1", "2"]:
+        raise HTTPException(status_code=400, detail="Plant must be 1 or 2")
+
+    # Check that at least one inference runtime is available
+    if not (TF_AVAILABLE or ORT_AVAILABLE):
+        raise HTTPException(status_code=503, detail="No inference runtime is available for predictions")
+
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+
+    data = get_timestamp_db(plant)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Timestamp file not found for plant {plant}")
+
+    # Determine the correct model file
+    model_file = f"ML/Plant{plant}_inverter_Model_V2.keras" if plant == "1" else f"ML/Plant{plant}_inverter_Model.keras"
+
+    if model_file not in loaded_models:
+        raise HTTPException(status_code=503, detail=f"Model for plant {plant} is not loaded")
+
+    model_entry = loaded_models[model_file]
+
+    # Validate and prepare each item; invalid items get an error entry so one
+    # bad timestamp does not fail the whole batch
+    results = []
+    sequences = []
+    valid_positions = []
+
+    for pos, item in enumerate(request.items):
+        result = {
+            "inverter": item.inverter,
+            "prediction_timestamp": item.timestamp
+        }
+
+        try:
+            if item.inverter not in data["inverters"]:
+                raise ValueError(f"Inverter {item.inverter} not found for plant {plant}")
+
+            if not is_valid_prediction_timestamp(plant, item.inverter, item.timestamp):
+                raise ValueError(f"Timestamp {item.timestamp} is not available for prediction")
+
+            X, _ = prepare_sequence_for_prediction(plant, item.inverter, item.timestamp)
+            sequences.append(X[0])
+            valid_positions.append(pos)
+            result["status"] = "success"
+        except (ValueError, KeyError) as e:
+            result["status"] = "error"
+            result["detail"] = str(e)
+
+        results.append(result)
+
+    # One stacked (B, 24, 8) forward pass amortizes the per-call overhead
+    if sequences:
+        scalers = get_or_create_scalers(plant)
+        X_batch = np.stack(sequences)
+        predictions_scaled = run_model(model_entry, X_batch)
+
+        for row, pos in enumerate(valid_positions):
+            predicted = predictions_scaled[row][0] / scalers['target_scale'] + scalers['target_min']
+            results[pos]["predicted_ac_power"] = round(max(0.0, float(predicted)), 2)
+
+    return {
+        "plant": plant,
+        "model_used": model_file,
+        "sequence_length": 24,
+        "batch_size": len(request.items),
+        "results": results
+    }
+
 # Load models when the module is imported
-if TF_AVAILABLE:
-    load_all_models()
\ No newline at end of file
+load_all_models()
\ No newline at end of file
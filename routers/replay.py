@@ -1,80 +1,121 @@
-from fastapi import APIRouter, Query
+from datetime import timedelta
+from functools import lru_cache
+from fastapi import APIRouter, Query, Response
 from fastapi.responses import JSONResponse
-import pandas as pd
 from main import client
+from routers.common import (QUERY_COLUMNS, arrow_response, parse_range, parse_timestamp,
+                            range_parameters, records_bytes, records_response,
+                            rollup_available, run_query)
 
 
 router = APIRouter()
 
+# Ranges longer than this are served from the hourly rollup measurement
+# written by data_prep.py, so response size scales with what is plotted
+# rather than with the raw 15-minute cardinality
+ROLLUP_THRESHOLD = timedelta(days=7)
+
+# Precomposed SQL templates keyed by plant (and rollup choice for ranges).
+# The measurement name cannot be bound as a parameter, so there is one
+# template per table; timestamps are bound server-side, which avoids
+# per-request string formatting and lets InfluxDB reuse the parsed statement.
+# The point lookup matches a single timestamp, so there is nothing to
+# order; ranges below keep ORDER BY because the frontend plots them in
+# sequence
+REPLAY_SQL = {
+    plant: f"SELECT {QUERY_COLUMNS} FROM plant{plant} WHERE time = $ts"
+    for plant in (1, 2)
+}
+REPLAY_RANGE_SQL = {
+    (plant, rollup): f"SELECT {QUERY_COLUMNS} FROM plant{plant}{'_1h' if rollup else ''} "
+                     f"WHERE time >= $start AND time < $end ORDER BY time"
+    for plant in (1, 2) for rollup in (False, True)
+}
+
+@lru_cache(maxsize=4096)
+def _replay_cached(plant, iso_ts):
+    """Query and serialize one replay frame; None when the timestamp has no rows.
+
+    The dataset is historical and immutable, so the serialized bytes for a
+    (plant, timestamp) pair never go stale and repeated scrubbing over the
+    same frames skips both the database and the JSON encode. Blocking: must
+    be called through asyncio.to_thread from the async endpoint.
+    """
+    result = client.query(query=REPLAY_SQL[plant], language="sql", mode="pandas",
+                          query_parameters={"ts": iso_ts})
+    if result.empty:
+        return None
+    return records_bytes(result)
+
 @router.get("/replay")
-def replay(
+async def replay(
     plant: int = Query(1, description="Choose plant: 1 or 2"),
     timestamp: str = Query(..., description="Format: YYYY-MM-DD HH:MM:SS")
 ):
     if client is None:
         return JSONResponse(status_code=503, content={"error": "Database connection unavailable"})
 
+    # Reject bad plant numbers before paying for any timestamp parsing
+    if plant not in (1, 2):
+        return JSONResponse(status_code=400, content={"error": "Invalid plant number"})
+
     try:
-        ts = pd.to_datetime(timestamp)
-    except Exception as e:
+        ts = parse_timestamp(timestamp)
+    except ValueError as e:
         return JSONResponse(status_code=400, content={"error": str(e)})
 
-    if plant not in [1, 2]:
-        return JSONResponse(status_code=400, content={"error": "Invalid plant number"})
-
     try:
-        # Query InfluxDB for data at the specific timestamp
-        query = f"""
-        SELECT *
-        FROM plant{plant}
-        WHERE time = '{ts.isoformat()}Z'
-        ORDER BY time
-        """
-        
-        result = client.query(query=query, language="sql", mode="pandas")
-        
-        if result.empty:
+        # Query InfluxDB for data at the specific timestamp; the helper
+        # memoizes the serialized response per (plant, timestamp)
+        body = await run_query(_replay_cached, plant, ts.isoformat())
+
+        if body is None:
             return {"message": "No data found for that timestamp."}
-        
-        return result.to_dict(orient="records")
-        
+
+        return Response(content=body, media_type="application/json")
+
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Database query failed: {str(e)}"})
 
 
 @router.get("/replay_range")
-def replay_range(
+async def replay_range(
     plant: int = Query(1, description="Plant number (1 or 2)"),
     start: str = Query(..., description="Start datetime in YYYY-MM-DD HH:MM:SS"),
-    end: str = Query(..., description="End datetime in YYYY-MM-DD HH:MM:SS")
+    end: str = Query(..., description="End datetime in YYYY-MM-DD HH:MM:SS"),
+    format: str = Query("json", description="Response format: json or arrow")
 ):
     if client is None:
         return JSONResponse(status_code=503, content={"error": "Database connection unavailable"})
         
+    if plant not in (1, 2):
+        return JSONResponse(status_code=400, content={"error": "Invalid plant number"})
+
     try:
-        start_ts = pd.to_datetime(start)
-        end_ts = pd.to_datetime(end)
-    except Exception as e:
+        start_ts, end_ts = parse_range(start, end)
+    except ValueError as e:
         return JSONResponse(status_code=400, content={"error": str(e)})
 
-    if plant not in [1, 2]:
-        return JSONResponse(status_code=400, content={"error": "Invalid plant number"})
-
     try:
-        # Query InfluxDB for data in the time range for the specific plant
-        query = f"""
-        SELECT *
-        FROM plant{plant}
-        WHERE time >= '{start_ts.isoformat()}Z' AND time <= '{end_ts.isoformat()}Z'
-        ORDER BY time
-        """
-        
-        result = client.query(query=query, language="sql", mode="pandas")
-        
+        # Query InfluxDB for data in the time range for the specific plant;
+        # long ranges go to the downsampled rollup table when it exists
+        # (databases ingested before the rollup was added don't have it)
+        rollup = (end_ts - start_ts > ROLLUP_THRESHOLD
+                  and await run_query(rollup_available, plant))
+        # format=arrow keeps the server-side Arrow batches as-is and streams
+        # them binary, skipping both the pandas materialization and JSON
+        result = await run_query(
+            client.query, query=REPLAY_RANGE_SQL[(plant, rollup)], language="sql",
+            mode="all" if format == "arrow" else "pandas",
+            query_parameters=range_parameters(start_ts, end_ts))
+
+        if format == "arrow":
+            return arrow_response(result)
+
         if result.empty:
             return {"message": "No data found in the given range."}
-        
-        return result.to_dict(orient="records")
+
+        return records_response(result)
         
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Database query failed: {str(e)}"})
\ No newline at end of file
@@ -1,74 +1,103 @@
+import time
+from datetime import timedelta
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
-import pandas as pd
 from main import client
+from routers.common import (QUERY_COLUMNS, arrow_response, parse_range,
+                            range_parameters, records_response, rollup_available,
+                            run_query)
 
 router = APIRouter()
 
+# Ranges longer than this are served from the hourly rollup measurement
+# written by data_prep.py (see routers/replay.py)
+ROLLUP_THRESHOLD = timedelta(days=7)
+
+# Precomposed SQL templates keyed by plant (and rollup choice); values are
+# bound server-side instead of interpolated per request
+PANELS_SQL = {
+    plant: f'SELECT DISTINCT("SOURCE_KEY") as SOURCE_KEY FROM plant{plant}'
+    for plant in (1, 2)
+}
+PANEL_DATA_SQL = {
+    (plant, rollup): f'SELECT {QUERY_COLUMNS} FROM plant{plant}{"_1h" if rollup else ""} '
+                     f'WHERE time >= $start AND time < $end AND "SOURCE_KEY" = $panel ORDER BY time'
+    for plant in (1, 2) for rollup in (False, True)
+}
+
+# The panel list is effectively static for this dataset, so the result of the
+# expensive DISTINCT scan is kept for a short TTL instead of re-queried per call
+panels_cache = {}
+PANELS_TTL = 300  # seconds
+
 @router.get("/panels")
-def get_panels(plant: int = Query(1, description="Plant number (1 or 2)")):
+async def get_panels(plant: int = Query(1, description="Plant number (1 or 2)")):
     if client is None:
         return JSONResponse(status_code=503, content={"error": "Database connection unavailable"})
     
-    if plant not in [1, 2]:
+    if plant not in (1, 2):
         return JSONResponse(status_code=400, content={"error": "Invalid plant number"})
-    
+
+    cached = panels_cache.get(plant)
+    if cached and time.monotonic() - cached[0] < PANELS_TTL:
+        return {"panels": cached[1]}
+
     try:
         # Query InfluxDB to get distinct SOURCE_KEY values for the plant
-        query = f"""
-        SELECT DISTINCT("SOURCE_KEY") as SOURCE_KEY
-        FROM plant{plant}
-        """
-        
-        result = client.query(query=query, language="sql", mode="pandas")
-        
+        result = await run_query(
+            client.query, query=PANELS_SQL[plant], language="sql", mode="pandas")
+
         if result.empty:
             return {"panels": []}
-        
+
         panel_ids = result["SOURCE_KEY"].tolist()
-        print(f"[DEBUG] Plant {plant} has panels: {panel_ids}")
-        
+        panels_cache[plant] = (time.monotonic(), panel_ids)
+
         return {"panels": panel_ids}
         
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Database query failed: {str(e)}"})
 
 @router.get("/panel_data")
-def get_panel_data(
+async def get_panel_data(
     plant: int = Query(1, description="Plant number (1 or 2)"),
     panel: str = Query(..., description="Source Key of the panel"),
     start: str = Query(..., description="Start datetime"),
-    end: str = Query(..., description="End datetime")
+    end: str = Query(..., description="End datetime"),
+    format: str = Query("json", description="Response format: json or arrow")
 ):
     if client is None:
         return JSONResponse(status_code=503, content={"error": "Database connection unavailable"})
     
+    # Reject bad plant numbers before paying for any timestamp parsing
+    if plant not in (1, 2):
+        return JSONResponse(status_code=400, content={"error": "Invalid plant number"})
+
     try:
-        start_ts = pd.to_datetime(start)
-        end_ts = pd.to_datetime(end)
-    except Exception as e:
+        start_ts, end_ts = parse_range(start, end)
+    except ValueError as e:
         return JSONResponse(status_code=400, content={"error": str(e)})
 
-    if plant not in [1, 2]:
-        return JSONResponse(status_code=400, content={"error": "Invalid plant number"})
-
     try:
-        # Query InfluxDB for specific panel data in time range
-        query = f"""
-        SELECT *
-        FROM plant{plant}
-        WHERE time >= '{start_ts.isoformat()}Z' 
-            AND time <= '{end_ts.isoformat()}Z'
-            AND "SOURCE_KEY" = '{panel}'
-        ORDER BY time
-        """
-        
-        result = client.query(query=query, language="sql", mode="pandas")
-        
+        # Query InfluxDB for specific panel data in time range; long ranges
+        # go to the downsampled rollup table when it exists (databases
+        # ingested before the rollup was added don't have it)
+        rollup = (end_ts - start_ts > ROLLUP_THRESHOLD
+                  and await run_query(rollup_available, plant))
+        # format=arrow keeps the server-side Arrow batches as-is and streams
+        # them binary, skipping both the pandas materialization and JSON
+        result = await run_query(
+            client.query, query=PANEL_DATA_SQL[(plant, rollup)], language="sql",
+            mode="all" if format == "arrow" else "pandas",
+            query_parameters=dict(range_parameters(start_ts, end_ts), panel=panel))
+
+        if format == "arrow":
+            return arrow_response(result)
+
         if result.empty:
             return {"message": "No data for the specified panel in this time range."}
-        
-        return result.to_dict(orient="records")
+
+        return records_response(result)
         
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Database query failed: {str(e)}"})
\ No newline at end of file
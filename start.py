@@ -9,10 +9,29 @@ import sys
 import time
 import os
 import platform
+import queue
+import selectors
+import shutil
 import signal
 import re
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from pathlib import Path
 
+# The platform cannot change while the launcher runs, so it is probed once
+# instead of calling platform.system() at every branch
+IS_WINDOWS = platform.system() == 'Windows'
+IS_MAC = platform.system() == 'Darwin'
+
+# Venv executable locations, resolved once per platform
+VENV_PYTHON = str(Path("venv/Scripts/python.exe") if IS_WINDOWS else Path("venv/bin/python"))
+VENV_PIP = str(Path("venv/Scripts/pip") if IS_WINDOWS else Path("venv/bin/pip"))
+
+# Precompiled once; matches the dev-server URL in Vite's startup banner
+VITE_URL_RE = re.compile(r'https?://[^\s]+')
+
 # ANSI color codes for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -24,25 +43,40 @@ class Colors:
     END = '\033[0m'
     BOLD = '\033[1m'
 
+# Strip the escape codes when stdout is piped so logs stay clean
+if not sys.stdout.isatty():
+    for _name in ('HEADER', 'BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'END', 'BOLD'):
+        setattr(Colors, _name, '')
+
+# Message prefixes/suffixes are assembled once; the helpers below then do a
+# single stdout write per line instead of rebuilding the color codes each call
+OK_PREFIX = f"{Colors.GREEN}✅ "
+INFO_PREFIX = f"{Colors.BLUE}ℹ️  "
+WARN_PREFIX = f"{Colors.YELLOW}⚠️  "
+ERROR_PREFIX = f"{Colors.RED}❌ "
+END_SUFFIX = Colors.END + "\n"
+HEADER_RULE = f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.END}\n"
+STEP_PREFIX = f"\n{Colors.CYAN}{Colors.BOLD}"
+
 def print_header(message):
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.END}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{message.center(70)}{Colors.END}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.END}\n")
+    sys.stdout.write(f"\n{HEADER_RULE}"
+                     f"{Colors.HEADER}{Colors.BOLD}{message.center(70)}{Colors.END}\n"
+                     f"{HEADER_RULE}\n")
 
 def print_success(message):
-    print(f"{Colors.GREEN}✅ {message}{Colors.END}")
+    sys.stdout.write(OK_PREFIX + message + END_SUFFIX)
 
 def print_info(message):
-    print(f"{Colors.BLUE}ℹ️  {message}{Colors.END}")
+    sys.stdout.write(INFO_PREFIX + message + END_SUFFIX)
 
 def print_warning(message):
-    print(f"{Colors.YELLOW}⚠️  {message}{Colors.END}")
+    sys.stdout.write(WARN_PREFIX + message + END_SUFFIX)
 
 def print_error(message):
-    print(f"{Colors.RED}❌ {message}{Colors.END}")
+    sys.stdout.write(ERROR_PREFIX + message + END_SUFFIX)
 
 def print_step(step_number, total_steps, message):
-    print(f"\n{Colors.CYAN}{Colors.BOLD}[Step {step_number}/{total_steps}] {message}{Colors.END}")
+    sys.stdout.write(f"{STEP_PREFIX}[Step {step_number}/{total_steps}] {message}{END_SUFFIX}")
 
 # Store process handles for cleanup
 processes = []
@@ -54,7 +88,7 @@ def cleanup_processes():
         try:
             if process and process.poll() is None:
                 print_info(f"Stopping {process_name}...")
-                if platform.system() == 'Windows':
+                if IS_WINDOWS:
                     process.terminate()
                 else:
                     process.send_signal(signal.SIGINT)
@@ -63,6 +97,37 @@ def cleanup_processes():
             print_error(f"Error stopping {process_name}: {e}")
     print_success("All services stopped")
 
+def wait_for_any_process():
+    """Block until one of the managed processes exits and return its name"""
+    if IS_WINDOWS:
+        # No os.wait() on Windows: park one thread per process in
+        # Popen.wait and wake when the first completes. The pool must not
+        # be joined here - shutdown(wait=True) would block on the waiter
+        # threads of the services that are still running, turning "first
+        # exit" into "all exited". shutdown(wait=False) lets the function
+        # return immediately; the leftover waiters unblock once cleanup
+        # terminates the remaining children
+        pool = ThreadPoolExecutor(max_workers=len(processes))
+        futures = {pool.submit(process.wait): name for name, process in processes}
+        done, _ = wait_futures(futures, return_when=FIRST_COMPLETED)
+        pool.shutdown(wait=False)
+        return futures[done.pop()]
+
+    # On POSIX a single os.wait() sleeps in the kernel until any child
+    # exits - no wakeups while everything is healthy
+    pid_names = {process.pid: (name, process) for name, process in processes}
+    while True:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            return None
+        if pid in pid_names:
+            name, process = pid_names[pid]
+            # os.wait already reaped the child; record the exit code so
+            # Popen bookkeeping (poll in cleanup) stays consistent
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return name
+
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
     cleanup_processes()
@@ -80,28 +145,35 @@ def check_python_version():
     return True
 
 def check_command_exists(command):
-    """Check if a command exists in PATH"""
-    try:
-        subprocess.run([command, "--version"], capture_output=True, check=False)
-        return True
-    except FileNotFoundError:
-        return False
+    """Check if a command exists in PATH (no subprocess spawn)"""
+    return shutil.which(command) is not None
+
+# Version lookups spawn a subprocess each, so the results are cached after
+# the first call - the installed versions cannot change mid-run
+_node_version = None
+_npm_version = None
 
 def get_node_version():
-    """Get installed Node.js version"""
-    try:
-        result = subprocess.run(["node", "--version"], capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except:
-        return None
+    """Get installed Node.js version (cached)"""
+    global _node_version
+    if _node_version is None:
+        try:
+            result = subprocess.run(["node", "--version"], capture_output=True, text=True, check=True)
+            _node_version = result.stdout.strip()
+        except:
+            _node_version = False
+    return _node_version or None
 
 def get_npm_version():
-    """Get installed npm version"""
-    try:
-        result = subprocess.run(["npm", "--version"], capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except:
-        return None
+    """Get installed npm version (cached)"""
+    global _npm_version
+    if _npm_version is None:
+        try:
+            result = subprocess.run(["npm", "--version"], capture_output=True, text=True, check=True)
+            _npm_version = result.stdout.strip()
+        except:
+            _npm_version = False
+    return _npm_version or None
 
 def check_influxdb3():
     """Check if influxdb3 CLI is installed"""
@@ -157,17 +229,33 @@ def setup_virtual_environment():
 
 def get_python_executable():
     """Get the path to the Python executable in venv"""
-    if platform.system() == 'Windows':
-        return str(Path("venv/Scripts/python.exe"))
-    else:
-        return str(Path("venv/bin/python"))
+    return VENV_PYTHON
 
 def get_pip_executable():
     """Get the path to pip in venv"""
-    if platform.system() == 'Windows':
-        return str(Path("venv/Scripts/pip"))
-    else:
-        return str(Path("venv/bin/pip"))
+    return VENV_PIP
+
+def run_streamed(cmd, label, cwd=None):
+    """Run a command, tee its output live, and return (ok, tail of lines).
+
+    Streams each line through print_info as it arrives - instead of holding
+    the whole output in memory with capture_output - while keeping the last
+    ~200 lines so a failure can show its context in one block even when
+    another install is interleaving output.
+    """
+    tail = deque(maxlen=200)
+    try:
+        process = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, text=True, bufsize=1)
+    except OSError as e:
+        tail.append(str(e))
+        return False, tail
+    for line in process.stdout:
+        line = line.rstrip()
+        if line:
+            print_info(f"[{label}] {line}")
+            tail.append(line)
+    return process.wait() == 0, tail
 
 def install_python_packages():
     """Install Python dependencies from requirements.txt"""
@@ -178,39 +266,46 @@ def install_python_packages():
         return False
     
     print_info("Installing Python packages (this may take a few minutes)...")
-    try:
-        # Upgrade pip first
-        subprocess.run([pip_exe, "install", "--upgrade", "pip"], 
-                      check=True, capture_output=True)
-        
-        # Install requirements
-        result = subprocess.run([pip_exe, "install", "-r", "requirements.txt"], 
-                               check=True, capture_output=True, text=True)
+    # Upgrade pip first, then install requirements
+    ok, tail = run_streamed([pip_exe, "install", "--upgrade", "pip"], "pip")
+    if ok:
+        ok, tail = run_streamed([pip_exe, "install", "-r", "requirements.txt"], "pip")
+    if ok:
         print_success("Python packages installed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print_error(f"Failed to install Python packages")
-        print_error(e.stderr if e.stderr else str(e))
-        return False
+    print_error("Failed to install Python packages - last output:")
+    for line in tail:
+        print_error(f"  {line}")
+    return False
 
 def check_data_files():
     """Check if required data files exist"""
-    required_files = [
-        "data/Plant_1_Generation_Data.csv",
-        "data/Plant_1_Weather_Sensor_Data.csv",
-        "data/Plant_2_Generation_Data.csv",
-        "data/Plant_2_Weather_Sensor_Data.csv",
-        "ML/Plant1_inverter_Model_V2.keras",
-        "ML/Plant2_inverter_Model.keras",
-        "ML/prediction_timestamps_plant_1.json",
-        "ML/prediction_timestamps_plant_2.json"
-    ]
-    
+    required_files = {
+        "data": [
+            "Plant_1_Generation_Data.csv",
+            "Plant_1_Weather_Sensor_Data.csv",
+            "Plant_2_Generation_Data.csv",
+            "Plant_2_Weather_Sensor_Data.csv"
+        ],
+        "ML": [
+            "Plant1_inverter_Model_V2.keras",
+            "Plant2_inverter_Model.keras",
+            "prediction_timestamps_plant_1.json",
+            "prediction_timestamps_plant_2.json"
+        ]
+    }
+
+    # One directory listing per folder instead of a stat call per file
     missing_files = []
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            missing_files.append(file_path)
-    
+    for directory, names in required_files.items():
+        try:
+            with os.scandir(directory) as entries:
+                present = {entry.name for entry in entries}
+        except FileNotFoundError:
+            present = set()
+        missing_files.extend(f"{directory}/{name}" for name in names if name not in present)
+
+
     if missing_files:
         print_error("Missing required files:")
         for file_path in missing_files:
@@ -239,19 +334,25 @@ def install_frontend_packages():
         return True
     
     print_info("Installing frontend packages...")
-    try:
-        subprocess.run(["npm", "install"], cwd=str(simulation_path), 
-                      check=True, capture_output=True)
+    ok, tail = run_streamed(["npm", "install"], "npm", cwd=str(simulation_path))
+    if ok:
         print_success("Frontend packages installed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print_error(f"Failed to install frontend packages: {e}")
-        return False
+    print_error("Failed to install frontend packages - last output:")
+    for line in tail:
+        print_error(f"  {line}")
+    return False
 
 def check_database_loaded():
     """Check if InfluxDB already has data"""
-    influxdb_dir = Path(".influxdb3")
-    if influxdb_dir.exists() and any(influxdb_dir.iterdir()):
+    # scandir stops at the first entry, so this never lists the whole
+    # directory just to learn it is non-empty
+    try:
+        with os.scandir(".influxdb3") as entries:
+            non_empty = next(iter(entries), None) is not None
+    except FileNotFoundError:
+        non_empty = False
+    if non_empty:
         print_success("Database directory exists (data may already be loaded)")
         return True
     print_info("Database directory empty or doesn't exist")
@@ -264,26 +365,59 @@ def load_database_data():
         return True
     
     print_info("Loading data into InfluxDB...")
-    print_warning("This may take 1-2 minutes...")
-    
+    print_warning("This may take a few minutes...")
+
     python_exe = get_python_executable()
+    env = {**os.environ, "INFLUX_BATCH_SIZE": "10000"}
+
+    # Stream the child's output so batch progress is visible instead of
+    # buffering minutes of stdout in memory
+    process = subprocess.Popen([python_exe, "data_prep.py"], env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, bufsize=1)
+    data_written = False
+    connected = False
+
+    # The read loop below blocks on the child's pipe, so a wall-clock timer
+    # enforces the deadline: if ingestion stalls while keeping the pipe open
+    # (e.g. a hung InfluxDB write), the timer kills the child, which closes
+    # the pipe and unblocks the loop
+    timed_out = threading.Event()
+
+    def _kill_on_timeout():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(600, _kill_on_timeout)
+    timer.start()
     try:
-        result = subprocess.run([python_exe, "data_prep.py"], 
-                               check=True, capture_output=True, text=True, timeout=180)
-        if "successfully written" in result.stdout:
-            print_success("Database data loaded successfully")
-        return True
-    except subprocess.TimeoutExpired:
-        print_error("Data loading timed out (took > 3 minutes)")
+        for line in process.stdout:
+            line = line.rstrip()
+            if line:
+                print_info(line)
+            if "successfully written" in line:
+                data_written = True
+            if "Connection Successful" in line:
+                connected = True
+        returncode = process.wait()
+    finally:
+        timer.cancel()
+
+    if timed_out.is_set():
+        print_error("Data loading timed out (took > 10 minutes)")
         return False
-    except subprocess.CalledProcessError as e:
-        print_error(f"Failed to load database data")
-        if "Connection Successful" in e.stdout:
+
+    if returncode != 0:
+        print_error("Failed to load database data")
+        if connected:
             print_success("Database connection OK, data may already be loaded")
             return True
-        print_error(e.stdout if e.stdout else str(e))
         return False
 
+    if data_written:
+        print_success("Database data loaded successfully")
+    return True
+
 def start_influxdb():
     """Start InfluxDB server"""
     print_info("Starting InfluxDB...")
@@ -349,33 +483,65 @@ def start_frontend():
             cwd="simulation",
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True
+            text=True,
+            bufsize=1
         )
         processes.append(("Frontend", process))
-        
-        # Wait for frontend to start and capture the URL
+
+        # Wait for frontend to start and capture the URL; wake on output
+        # rather than polling a blocking readline with a fixed sleep
         frontend_url = None
         timeout = 30
         start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if process.poll() is not None:
-                print_error("Frontend failed to start")
-                return False, None
-            
-            # Read output line by line
-            line = process.stdout.readline()
-            if line:
-                # Look for Vite server URL
+
+        if IS_WINDOWS:
+            # Pipes cannot be made non-blocking on Windows, so a helper
+            # thread feeds readline results into a queue
+            lines = queue.Queue()
+
+            def pump_output():
+                for pumped in process.stdout:
+                    lines.put(pumped)
+
+            threading.Thread(target=pump_output, daemon=True).start()
+
+            while time.time() - start_time < timeout:
+                if process.poll() is not None:
+                    print_error("Frontend failed to start")
+                    return False, None
+                try:
+                    line = lines.get(timeout=0.5)
+                except queue.Empty:
+                    continue
                 if "Local:" in line or "localhost" in line:
-                    # Extract URL using regex
-                    match = re.search(r'https?://[^\s]+', line)
+                    match = VITE_URL_RE.search(line)
                     if match:
                         frontend_url = match.group(0)
                         break
-            
-            time.sleep(0.1)
-        
+        else:
+            os.set_blocking(process.stdout.fileno(), False)
+            sel = selectors.DefaultSelector()
+            sel.register(process.stdout, selectors.EVENT_READ)
+            buffered = ""
+
+            while time.time() - start_time < timeout:
+                if process.poll() is not None:
+                    print_error("Frontend failed to start")
+                    return False, None
+                if not sel.select(timeout=0.5):
+                    continue
+                chunk = process.stdout.read()
+                if not chunk:
+                    continue
+                buffered += chunk
+                if "Local:" in buffered or "localhost" in buffered:
+                    match = VITE_URL_RE.search(buffered)
+                    if match:
+                        frontend_url = match.group(0)
+                        break
+
+            sel.close()
+
         if not frontend_url:
             frontend_url = "http://localhost:5173"
         
@@ -388,9 +554,9 @@ def start_frontend():
 def open_browser(url):
     """Open URL in default browser"""
     try:
-        if platform.system() == 'Darwin':  # macOS
+        if IS_MAC:
             subprocess.run(["open", url], check=True)
-        elif platform.system() == 'Windows':
+        elif IS_WINDOWS:
             os.startfile(url)  # Windows-specific method
         else:  # Linux
             subprocess.run(["xdg-open", url], check=True)
@@ -430,17 +596,19 @@ def main():
     if not setup_virtual_environment():
         sys.exit(1)
     
-    # Step 4: Install Python packages
+    # Steps 4+5: Install Python and frontend packages. pip and npm spend
+    # most of their time waiting on the network, so the two installs run
+    # side by side; the print helpers emit one write per line, which keeps
+    # the interleaved output readable. Both must succeed to continue.
     current_step += 1
     print_step(current_step, total_steps, "Installing Python dependencies")
-    if not install_python_packages():
-        sys.exit(1)
-    
-    # Step 5: Install frontend packages
     current_step += 1
     print_step(current_step, total_steps, "Installing frontend dependencies")
-    if not install_frontend_packages():
-        sys.exit(1)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        python_ok = pool.submit(install_python_packages)
+        frontend_ok = pool.submit(install_frontend_packages)
+        if not (python_ok.result() and frontend_ok.result()):
+            sys.exit(1)
     
     # Step 6: Start InfluxDB
     current_step += 1
@@ -492,16 +660,13 @@ def main():
     time.sleep(2)
     open_browser(frontend_url)
     
-    # Keep script running and monitor processes
+    # Block until a service dies instead of polling every second
     try:
-        while True:
-            time.sleep(1)
-            # Check if any process died
-            for name, process in processes:
-                if process.poll() is not None:
-                    print_error(f"{name} stopped unexpectedly!")
-                    cleanup_processes()
-                    sys.exit(1)
+        name = wait_for_any_process()
+        if name is not None:
+            print_error(f"{name} stopped unexpectedly!")
+        cleanup_processes()
+        sys.exit(1)
     except KeyboardInterrupt:
         cleanup_processes()
 